@@ -1,11 +1,13 @@
 """Audio Downloader - Replicates logic from spoti-down-m4a-opus-v4.2.py"""
 import os
 import asyncio
-import yt_dlp
 import subprocess
-from typing import Optional, Dict, Callable
+import threading
+from typing import Optional, Dict, Callable, List
 from dataclasses import dataclass
 
+from .matching import best_match
+
 
 @dataclass
 class QualityPreset:
@@ -25,8 +27,15 @@ class AudioDownloader:
     
     def __init__(self, output_dir: str = "downloads"):
         self.output_dir = output_dir
+        self.cancel_events: Dict[str, threading.Event] = {}
         os.makedirs(output_dir, exist_ok=True)
     
+    @staticmethod
+    def prewarm():
+        """Import yt-dlp and load its extractor classes ahead of the first download"""
+        import yt_dlp
+        yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True})
+    
     def get_download_options(self, quality_choice: str) -> Dict:
         """Get yt-dlp options based on quality selection"""
         preset = self.QUALITY_PRESETS.get(quality_choice, self.QUALITY_PRESETS['1'])
@@ -37,6 +46,8 @@ class AudioDownloader:
             'quiet': False,
             'no_warnings': False,
             'keepvideo': True,
+            # Resume from an existing .part file via HTTP Range when possible
+            'continuedl': True,
         }
         
         if preset.codec == 'best':
@@ -56,19 +67,126 @@ class AudioDownloader:
         
         return ydl_opts
     
+    def resolve(self, url: str) -> Optional[Dict]:
+        """Extract info and select the audio format without downloading
+        
+        Format selection is the same for every quality preset (conversion
+        happens afterwards), so the result can feed any download_from_url call.
+        """
+        import yt_dlp
+        ydl_opts = self.get_download_options('3')
+        ydl_opts.update({
+            'quiet': True,
+            'no_warnings': True,
+            'extractor_args': {'youtube': {'player_client': ['android', 'web']}},
+        })
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+        
+        # Search results come back as a playlist
+        if info and 'entries' in info:
+            entries = [entry for entry in info['entries'] if entry]
+            info = entries[0] if entries else None
+        if not info:
+            return None
+        return yt_dlp.YoutubeDL.sanitize_info(info, remove_private_keys=True)
+    
+    def search(self, query: str, count: int = 5) -> List[Dict]:
+        """Flat YouTube search: ids, titles and durations of the top results
+        
+        This is a single request; no result is extracted in full.
+        """
+        import yt_dlp
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'extract_flat': 'in_playlist',
+        }
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(f"ytsearch{count}:{query}", download=False)
+        return [entry for entry in (info or {}).get('entries') or [] if entry]
+    
+    def find_best_match(
+        self,
+        query: str,
+        metadata: Optional[Dict] = None,
+        candidates: int = 5
+    ) -> Optional[str]:
+        """Rank the top search results against the track, return the best URL
+        
+        Without metadata the query itself is used as the expected title,
+        which still steers away from live, cover and remix uploads.
+        """
+        metadata = metadata or {}
+        entry = best_match(
+            self.search(query, candidates),
+            title=metadata.get('title') or query,
+            artists=metadata.get('artists') or [],
+            duration=metadata.get('duration')
+        )
+        if not entry:
+            return None
+        return entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}"
+    
+    def resolve_best_match(
+        self,
+        query: str,
+        metadata: Optional[Dict] = None,
+        candidates: int = 5
+    ) -> Optional[Dict]:
+        """find_best_match followed by resolve (for speculative prefetch)"""
+        source = self.find_best_match(query, metadata, candidates)
+        return self.resolve(source) if source else None
+    
+    def cancel(self, job_id: str) -> bool:
+        """Stop a job's running download at its next progress update"""
+        event = self.cancel_events.get(job_id)
+        if event:
+            event.set()
+        return event is not None
+    
     async def download_from_url(
         self,
         url: str,
         quality_choice: str = '1',
         job_id: Optional[str] = None,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        state_callback: Optional[Callable] = None,
+        info: Optional[Dict] = None
     ) -> Dict:
-        """Download audio from direct URL (JioSaavn, YouTube, etc.)"""
+        """Download audio from direct URL (JioSaavn, YouTube, etc.)
+        
+        state_callback(partial_file, source_url) is called once the download
+        starts writing, so the caller can resume it after a restart. A
+        pre-resolved info dict (see resolve) skips extraction entirely.
+        The result lists the files yt-dlp downloaded as 'source_files'.
+        """
+        cancel_event = threading.Event()
+        if job_id:
+            self.cancel_events[job_id] = cancel_event
         try:
             ydl_opts = self.get_download_options(quality_choice)
+            reported_partials = set()
+            source_files = []
             
             # Add progress hook
             def progress_hook(d):
+                if cancel_event.is_set():
+                    from yt_dlp.utils import DownloadCancelled
+                    raise DownloadCancelled(f"Download for job {job_id} was cancelled")
+                
+                if d['status'] == 'finished' and d.get('filename'):
+                    source_files.append(d['filename'])
+                
+                partial_file = d.get('tmpfilename')
+                if state_callback and partial_file and partial_file not in reported_partials:
+                    reported_partials.add(partial_file)
+                    try:
+                        info = d.get('info_dict') or {}
+                        state_callback(partial_file, info.get('webpage_url'))
+                    except Exception:
+                        pass
+                
                 if progress_callback and d['status'] == 'downloading':
                     try:
                         percent = d.get('_percent_str', '0%').strip('%')
@@ -90,24 +208,36 @@ class AudioDownloader:
                 self._download_sync,
                 url,
                 ydl_opts,
-                progress_callback
+                progress_callback,
+                info
             )
+            if result['success']:
+                result['source_files'] = source_files
             
             return result
             
         except Exception as e:
             return {'success': False, 'error': str(e)}
+        finally:
+            if job_id and self.cancel_events.get(job_id) is cancel_event:
+                del self.cancel_events[job_id]
     
     def _download_sync(
         self,
         url: str,
         ydl_opts: Dict,
-        progress_callback: Optional[Callable]
+        progress_callback: Optional[Callable],
+        info: Optional[Dict] = None
     ) -> Dict:
         """Synchronous download helper"""
         try:
+            # yt-dlp is imported lazily; it is the slowest import in the app
+            import yt_dlp
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
+                if info:
+                    info = ydl.process_ie_result(info, download=True)
+                else:
+                    info = ydl.extract_info(url, download=True)
                 
                 # Get downloaded filename
                 if 'requested_downloads' in info and info['requested_downloads']:
@@ -132,7 +262,9 @@ class AudioDownloader:
         quality_choice: str = '1',
         job_id: Optional[str] = None,
         metadata: Optional[Dict] = None,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        state_callback: Optional[Callable] = None,
+        info: Optional[Dict] = None
     ) -> Dict:
         """Download from YouTube with optional metadata embedding"""
         try:
@@ -140,7 +272,9 @@ class AudioDownloader:
                 url=url,
                 quality_choice=quality_choice,
                 job_id=job_id,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                state_callback=state_callback,
+                info=info
             )
             
             if result['success'] and metadata:
@@ -148,11 +282,11 @@ class AudioDownloader:
                 if progress_callback:
                     progress_callback(0.95, "Embedding metadata...")
                 
-                result = await self._embed_metadata(
+                result = {**result, **await self._embed_metadata(
                     result['filename'],
                     metadata,
                     progress_callback
-                )
+                )}
             
             return result
             
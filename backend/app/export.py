@@ -0,0 +1,67 @@
+"""Export - stream finished downloads as a single ZIP archive"""
+import os
+import zipfile
+from typing import Iterator, List, Tuple
+
+CHUNK_SIZE = 256 * 1024
+
+
+class _StreamSink:
+    """Write-only file object; zipfile writes into it, the generator drains it
+
+    Having no tell()/seek() makes zipfile write sizes and CRCs in data
+    descriptors after each file instead of seeking back to patch headers.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def archive_names(paths: List[str]) -> List[Tuple[str, str]]:
+    """Pair each path with a unique name inside the archive"""
+    used = set()
+    files = []
+    for path in paths:
+        base, ext = os.path.splitext(os.path.basename(path))
+        name = f"{base}{ext}"
+        n = 2
+        while name in used:
+            name = f"{base} ({n}){ext}"
+            n += 1
+        used.add(name)
+        files.append((path, name))
+    return files
+
+
+def stream_zip(files: List[Tuple[str, str]], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a stored (uncompressed) ZIP of files as it is written
+
+    Audio is already compressed, so entries are stored as-is. Memory use is
+    bounded by chunk_size; nothing is buffered on disk.
+    """
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        for path, name in files:
+            info = zipfile.ZipInfo.from_file(path, name)
+            info.compress_type = zipfile.ZIP_STORED
+            with open(path, 'rb') as source, archive.open(info, mode='w') as entry:
+                while True:
+                    chunk = source.read(chunk_size)
+                    if not chunk:
+                        break
+                    entry.write(chunk)
+                    yield sink.take()
+            yield sink.take()
+    yield sink.take()
@@ -0,0 +1,55 @@
+"""HTTP caching helpers - ETags and conditional GET for JSON endpoints"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag derived from a response body"""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def cached_json(
+    request: Request,
+    payload: BaseModel,
+    etag: Optional[str] = None,
+    cache_control: str = "no-cache"
+) -> Response:
+    """Serialize payload with ETag and Cache-Control, or answer 304
+
+    When the ETag is known up front (e.g. from a version counter) and the
+    client already has it, the payload is never serialized.
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if etag and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': cache_control})
+
+    body = payload.model_dump_json().encode()
+    if not etag:
+        etag = content_etag(body)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': cache_control})
+
+    return Response(
+        content=body,
+        media_type='application/json',
+        headers={'ETag': etag, 'Cache-Control': cache_control}
+    )
@@ -1,14 +1,13 @@
 """JioSaavn API Client - Replicates logic from spoti-down-m4a-opus-v4.2.py"""
-import requests
 from typing import Optional, Dict
 
 
 class JioSaavnAPI:
     """Handle JioSaavn API and audio extraction"""
     
-    def __init__(self):
+    def __init__(self, api_url: str = "https://www.jiosaavn.com/api.php"):
         self.base_url = "https://www.jiosaavn.com"
-        self.api_url = "https://www.jiosaavn.com/api.php"
+        self.api_url = api_url
     
     def get_song_details(self, song_url: str) -> Optional[Dict]:
         """Get song details from JioSaavn URL"""
@@ -26,6 +25,7 @@ class JioSaavnAPI:
                 '_marker': '0'
             }
             
+            import requests  # deferred to keep startup fast
             api_response = requests.get(self.api_url, params=params, timeout=10)
             api_response.raise_for_status()
             data = api_response.json()
@@ -86,6 +86,7 @@ class JioSaavnAPI:
                 '_marker': '0'
             }
             
+            import requests
             response = requests.get(self.api_url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
@@ -1,7 +1,11 @@
 """Job Manager for tracking download jobs"""
+import time
+from bisect import bisect_left, insort
 from enum import Enum
-from typing import Dict, Optional
-from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+
+from .job_store import JobStore
 
 
 class JobStatus(str, Enum):
@@ -12,18 +16,149 @@ class JobStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+def _discard(index: Optional[List[Tuple[str, str]]], key: Tuple[str, str]):
+    if not index:
+        return
+    i = bisect_left(index, key)
+    if i < len(index) and index[i] == key:
+        del index[i]
+
+
 class JobManager:
-    """Manage download jobs and their status"""
+    """Manage download jobs and their status
+    
+    With a JobStore, every job is also written to disk so it can be restored
+    after a restart. Progress-only updates are written at most once per
+    persist_interval per job; other changes are written immediately.
+    
+    Jobs are also indexed by status and platform, each index a list of
+    (created_at, job_id) kept sorted, so filtered and paginated queries
+    only touch the jobs they return.
+    
+    Finished jobs are forgotten, in memory and in the store, once they have
+    not changed for retention seconds (0 keeps them forever).
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        persist_interval: float = 2.0,
+        retention: float = 0.0
+    ):
         self.jobs: Dict[str, Dict] = {}
+        self.client_jobs: Dict[str, Set[str]] = {}
+        self.store = store
+        self.persist_interval = persist_interval
+        self.retention = retention
+        self._persisted_at: Dict[str, float] = {}
+        # Store seq the restored jobs are current as of
+        self.restored_seq = 0
+        self.by_created: List[Tuple[str, str]] = []
+        self.by_status: Dict[str, List[Tuple[str, str]]] = {}
+        self.by_platform: Dict[str, List[Tuple[str, str]]] = {}
+    
+    def _index(self, job: Dict):
+        if job.get('client_id'):
+            self.client_jobs.setdefault(job['client_id'], set()).add(job['job_id'])
+        key = (job['created_at'], job['job_id'])
+        insort(self.by_created, key)
+        insort(self.by_status.setdefault(job['status'], []), key)
+        if job.get('platform'):
+            insort(self.by_platform.setdefault(job['platform'], []), key)
+    
+    def _unindex(self, job: Dict):
+        if job.get('client_id'):
+            client_jobs = self.client_jobs.get(job['client_id'])
+            if client_jobs:
+                client_jobs.discard(job['job_id'])
+                if not client_jobs:
+                    del self.client_jobs[job['client_id']]
+        key = (job['created_at'], job['job_id'])
+        _discard(self.by_created, key)
+        _discard(self.by_status.get(job['status']), key)
+        if job.get('platform'):
+            _discard(self.by_platform.get(job['platform']), key)
+    
+    def _persist(self, job: Dict, force: bool = True):
+        if not self.store:
+            return
+        now = time.monotonic()
+        if not force and now - self._persisted_at.get(job['job_id'], 0.0) < self.persist_interval:
+            return
+        self._persisted_at[job['job_id']] = now
+        self.store.save(job)
+    
+    def restore(self) -> List[Dict]:
+        """Load persisted jobs and return the ones that never finished"""
+        if not self.store:
+            return []
+        
+        self.prune()
+        # Read before loading: a write in between is seen again, never missed
+        self.restored_seq = self.store.last_seq()
+        unfinished = []
+        for job in self.store.load_all():
+            self.apply(job)
+            if job['status'] not in TERMINAL_STATUSES:
+                unfinished.append(job)
+        return unfinished
+    
+    def prune(self) -> int:
+        """Forget finished jobs older than the retention period
+        
+        Returns how many jobs were removed.
+        """
+        if not self.retention:
+            return 0
+        cutoff = (datetime.now() - timedelta(seconds=self.retention)).isoformat()
+        
+        removed = set(self.store.prune(cutoff)) if self.store else set()
+        for status in TERMINAL_STATUSES:
+            index = self.by_status.get(status, [])
+            # created_at never exceeds updated_at, so newer jobs can be skipped
+            for _, job_id in index[:bisect_left(index, (cutoff,))]:
+                if self.jobs[job_id]['updated_at'] < cutoff:
+                    removed.add(job_id)
+        for job_id in removed:
+            self.unload(job_id)
+        return len(removed)
+    
+    def load_job(self, job_id: str) -> Optional[Dict]:
+        """Load a single job from the store into memory"""
+        if not self.store:
+            return None
+        job = self.store.load(job_id)
+        if job:
+            self.apply(job)
+        return job
+    
+    def apply(self, job: Dict):
+        """Take a job snapshot written by another process (no write-back)"""
+        job['status'] = JobStatus(job['status'])
+        current = self.jobs.get(job['job_id'])
+        if current:
+            self._unindex(current)
+        self.jobs[job['job_id']] = job
+        self._index(job)
+    
+    def unload(self, job_id: str):
+        """Drop a job from memory, leaving the stored copy"""
+        job = self.jobs.pop(job_id, None)
+        self._persisted_at.pop(job_id, None)
+        if job:
+            self._unindex(job)
     
     def create_job(
         self,
         job_id: str,
         url: str,
         quality: str,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        client_id: Optional[str] = None,
+        platform: Optional[str] = None
     ):
         """Create a new job"""
         self.jobs[job_id] = {
@@ -31,14 +166,21 @@ class JobManager:
             'url': url,
             'quality': quality,
             'metadata': metadata,
+            'client_id': client_id,
+            'platform': platform,
+            'version': 0,
             'status': JobStatus.PENDING,
             'progress': 0.0,
             'current_line': 'Job created',
             'error': None,
             'result_file': None,
+            'partial_file': None,
+            'source_url': None,
             'created_at': datetime.now().isoformat(),
             'updated_at': datetime.now().isoformat()
         }
+        self._index(self.jobs[job_id])
+        self._persist(self.jobs[job_id])
     
     def update_job(
         self,
@@ -47,7 +189,9 @@ class JobManager:
         progress: Optional[float] = None,
         current_line: Optional[str] = None,
         error: Optional[str] = None,
-        result_file: Optional[str] = None
+        result_file: Optional[str] = None,
+        partial_file: Optional[str] = None,
+        source_url: Optional[str] = None
     ):
         """Update job status"""
         if job_id not in self.jobs:
@@ -55,7 +199,10 @@ class JobManager:
         
         job = self.jobs[job_id]
         
-        if status is not None:
+        if status is not None and status != job['status']:
+            key = (job['created_at'], job_id)
+            _discard(self.by_status.get(job['status']), key)
+            insort(self.by_status.setdefault(status, []), key)
             job['status'] = status
         if progress is not None:
             job['progress'] = progress
@@ -65,8 +212,19 @@ class JobManager:
             job['error'] = error
         if result_file is not None:
             job['result_file'] = result_file
+        if partial_file is not None:
+            job['partial_file'] = partial_file
+        if source_url is not None:
+            job['source_url'] = source_url
         
+        job['version'] += 1
         job['updated_at'] = datetime.now().isoformat()
+        
+        progress_only = (
+            status is None and error is None and result_file is None
+            and partial_file is None and source_url is None
+        )
+        self._persist(job, force=not progress_only)
     
     def get_job(self, job_id: str) -> Optional[Dict]:
         """Get job details"""
@@ -74,9 +232,57 @@ class JobManager:
     
     def delete_job(self, job_id: str):
         """Delete a job"""
-        if job_id in self.jobs:
-            del self.jobs[job_id]
+        job = self.jobs.pop(job_id, None)
+        self._persisted_at.pop(job_id, None)
+        if self.store:
+            self.store.delete(job_id)
+        if job:
+            self._unindex(job)
+    
+    def jobs_for_client(self, client_id: str) -> Set[str]:
+        """Get ids of all jobs created by a client"""
+        return self.client_jobs.get(client_id, set())
     
     def list_jobs(self) -> Dict[str, Dict]:
         """List all jobs"""
         return self.jobs
+    
+    def query_jobs(
+        self,
+        status: Optional[str] = None,
+        platform: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None,
+        limit: int = 50
+    ) -> List[Dict]:
+        """Query jobs newest first
+        
+        created_after is inclusive and created_before exclusive (ISO
+        timestamps). after is the (created_at, job_id) key of the last job
+        of the previous page. The smaller matching index is scanned from its
+        newest end and the other filter is checked per job.
+        """
+        indexes = []
+        if status is not None:
+            indexes.append(self.by_status.get(status, []))
+        if platform is not None:
+            indexes.append(self.by_platform.get(platform, []))
+        index = min(indexes, key=len) if indexes else self.by_created
+        
+        low = bisect_left(index, (created_after,)) if created_after else 0
+        high = bisect_left(index, (created_before,)) if created_before else len(index)
+        if after:
+            high = min(high, bisect_left(index, after))
+        
+        jobs = []
+        for i in range(high - 1, low - 1, -1):
+            job = self.jobs[index[i][1]]
+            if status is not None and job['status'] != status:
+                continue
+            if platform is not None and job.get('platform') != platform:
+                continue
+            jobs.append(job)
+            if len(jobs) >= limit:
+                break
+        return jobs
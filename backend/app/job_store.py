@@ -0,0 +1,139 @@
+"""Job Store - durable SQLite copy of job state so jobs survive restarts"""
+import json
+import sqlite3
+import threading
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+
+class JobStore:
+    """Persist job dicts as JSON rows in a local SQLite database
+
+    Every write stamps the row with the next value of a sequence (seq),
+    assigned under the write lock, so seq order is commit order even when
+    several processes write. Readers follow changes by seq, not by clock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Worker processes share the database, so wait on locks instead of failing
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                data TEXT NOT NULL,
+                seq INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if 'seq' not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_seq ON jobs (seq)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated_at)")
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, Enum):
+            return value.value
+        if hasattr(value, 'model_dump'):
+            return value.model_dump(mode='json')
+        raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+    def save(self, job: Dict):
+        """Insert or replace a job"""
+        data = json.dumps(job, default=self._encode)
+        status = job['status'].value if isinstance(job['status'], Enum) else job['status']
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO jobs (job_id, status, created_at, updated_at, data, seq) "
+                    "VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM jobs))",
+                    (job['job_id'], status, job['created_at'], job['updated_at'], data)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load(self, job_id: str) -> Optional[Dict]:
+        """Load a single job"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_all(self) -> List[Dict]:
+        """Load every job, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs ORDER BY created_at"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def load_unfinished(self) -> List[Dict]:
+        """Load jobs that are not completed, failed or cancelled"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs WHERE status NOT IN ('completed', 'failed', 'cancelled')"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def changed_since(self, seq: int) -> Tuple[List[Dict], int]:
+        """Load jobs written after seq, oldest write first
+
+        Returns the jobs and the seq to pass next time.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, seq FROM jobs WHERE seq > ? ORDER BY seq",
+                (seq,)
+            ).fetchall()
+        if not rows:
+            return [], seq
+        return [json.loads(row[0]) for row in rows], rows[-1][1]
+
+    def prune(self, updated_before: str) -> List[str]:
+        """Delete finished jobs last updated before a timestamp, returning their ids"""
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                rows = self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE updated_at < ?"
+                    " AND status IN ('completed', 'failed', 'cancelled')",
+                    (updated_before,)
+                ).fetchall()
+                self._conn.executemany(
+                    "DELETE FROM jobs WHERE job_id = ?", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [row[0] for row in rows]
+    
+    def last_seq(self) -> int:
+        """Highest seq written so far, 0 for an empty store"""
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM jobs").fetchone()
+        return row[0]
+    
+    def delete(self, job_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,93 @@
+"""Multiplexed job watching - compact per-tick deltas for many jobs"""
+from typing import Dict, Iterable, Optional, Set
+
+from .job_manager import JobManager, TERMINAL_STATUSES
+
+
+class JobWatch:
+    """Track a subscriber's job set and what it has already been sent
+
+    A subscriber watches explicit job ids, all jobs of a client id, or both.
+    Each call to poll() returns only the fields that changed since the last
+    call, so one message per tick covers every job on the connection.
+    """
+
+    FIELDS = ('status', 'progress', 'current_line', 'error', 'result_file')
+
+    def __init__(
+        self,
+        job_manager: JobManager,
+        job_ids: Optional[Iterable[str]] = None,
+        client_id: Optional[str] = None
+    ):
+        self.job_manager = job_manager
+        self.job_ids: Set[str] = set(job_ids or [])
+        self.client_id = client_id
+        self.versions: Dict[str, int] = {}
+        self.sent: Dict[str, Dict] = {}
+
+    def subscribe(self, job_ids: Iterable[str]):
+        self.job_ids.update(job_ids)
+
+    def unsubscribe(self, job_ids: Iterable[str]):
+        for job_id in job_ids:
+            self.job_ids.discard(job_id)
+            self.versions.pop(job_id, None)
+            self.sent.pop(job_id, None)
+
+    def watched(self) -> Set[str]:
+        """Explicit job ids plus every job belonging to the client"""
+        if self.client_id:
+            return self.job_ids | self.job_manager.jobs_for_client(self.client_id)
+        return self.job_ids
+
+    def poll(self) -> Dict[str, Dict]:
+        """Collect changed fields per job since the previous poll"""
+        deltas = {}
+        for job_id in self.watched():
+            job = self.job_manager.get_job(job_id)
+            if not job:
+                if not self.sent.get(job_id, {}).get('missing'):
+                    deltas[job_id] = {'missing': True}
+                    self.sent[job_id] = {'missing': True}
+                continue
+
+            if self.versions.get(job_id) == job['version']:
+                continue
+            self.versions[job_id] = job['version']
+
+            current = {
+                'status': job['status'].value,
+                'progress': round(job['progress'], 3),
+                'current_line': job['current_line'],
+                'error': job.get('error'),
+                'result_file': job.get('result_file'),
+            }
+            previous = self.sent.get(job_id, {})
+            delta = {
+                field: value for field, value in current.items()
+                if field not in previous or previous[field] != value
+            }
+            self.sent[job_id] = current
+            if delta:
+                deltas[job_id] = delta
+
+        return deltas
+
+    def finished(self) -> bool:
+        """True when every explicitly watched job is terminal and delivered
+
+        Client subscriptions never finish on their own since new jobs for
+        the client can appear at any time.
+        """
+        if self.client_id:
+            return False
+        for job_id in self.job_ids:
+            job = self.job_manager.get_job(job_id)
+            if not job:
+                continue
+            if job['status'] not in TERMINAL_STATUSES:
+                return False
+            if self.versions.get(job_id) != job['version']:
+                return False
+        return True
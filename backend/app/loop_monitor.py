@@ -0,0 +1,146 @@
+"""Event-loop lag monitor and blocking-call detector"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Measure event-loop lag and capture the stack of blocking callbacks
+
+    A probe coroutine sleeps for a fixed interval and records how late it
+    wakes up. A watchdog thread watches the probe's heartbeat; when the loop
+    has not come back for longer than the threshold, it snapshots the loop
+    thread's stack, which points at whatever is blocking it.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        threshold: float = 0.25,
+        history: int = 600,
+        max_stalls: int = 20
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags: Deque[float] = deque(maxlen=history)
+        self.stalls: Deque[Dict] = deque(maxlen=max_stalls)
+        self.stalls_total = 0
+        self.max_lag = 0.0
+
+        self._heartbeat = time.monotonic()
+        self._current_stall: Optional[Dict] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    async def start(self):
+        """Start probing the running loop"""
+        if self._task:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self):
+        """Stop the probe and watchdog"""
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _probe(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - before - self.interval, 0.0)
+
+            with self._lock:
+                self._heartbeat = now
+                self.lags.append(lag)
+                self.max_lag = max(self.max_lag, lag)
+                stall = self._current_stall
+                self._current_stall = None
+
+            if stall:
+                stall['duration_ms'] = round(lag * 1000, 1)
+                logger.warning(
+                    "Event loop was blocked for %.0f ms (stack captured at %s)",
+                    lag * 1000, stall['detected_at']
+                )
+
+    def _watch(self):
+        """Watchdog thread: capture the loop thread's stack when it stalls"""
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stopped.wait(poll):
+            with self._lock:
+                blocked_for = time.monotonic() - self._heartbeat - self.interval
+                if blocked_for < self.threshold or self._current_stall:
+                    continue
+                stall = {
+                    'detected_at': datetime.now().isoformat(),
+                    'blocked_ms_at_detection': round(blocked_for * 1000, 1),
+                    'duration_ms': None,
+                    'stack': self._capture_stack(),
+                }
+                self._current_stall = stall
+                self.stalls.append(stall)
+                self.stalls_total += 1
+
+            logger.warning(
+                "Event loop blocked for more than %.0f ms, loop thread stack:\n%s",
+                self.threshold * 1000, ''.join(stall['stack'])
+            )
+
+    def _capture_stack(self) -> List[str]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)
+
+    def snapshot(self) -> Dict:
+        """Lag statistics and recent stalls for the metrics endpoint"""
+        with self._lock:
+            lags = sorted(self.lags)
+            stalls = list(self.stalls)
+            current = self.lags[-1] if self.lags else 0.0
+
+        def pct(p: float) -> float:
+            if not lags:
+                return 0.0
+            return lags[min(len(lags) - 1, int(p / 100.0 * len(lags)))]
+
+        return {
+            'running': self._task is not None,
+            'interval_ms': self.interval * 1000,
+            'threshold_ms': self.threshold * 1000,
+            'samples': len(lags),
+            'lag_ms': {
+                'current': round(current * 1000, 2),
+                'p50': round(pct(50) * 1000, 2),
+                'p99': round(pct(99) * 1000, 2),
+                'max': round(self.max_lag * 1000, 2),
+            },
+            'stalls_total': self.stalls_total,
+            'recent_stalls': stalls,
+        }
@@ -2,14 +2,21 @@
 FastAPI Backend for Spowlo Music Downloader
 Replicates functionality from spoti-down-m4a-opus-v4.2.py
 """
+import time
+
+IMPORT_STARTED = time.perf_counter()
+
 import asyncio
+import base64
+import importlib
+import json
 import os
 import uuid
 from typing import Optional, Dict, List
 from datetime import datetime
 from enum import Enum
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -17,7 +24,19 @@ from pydantic import BaseModel
 from .spotify_client import SpotifyAPI
 from .jiosaavn_client import JioSaavnAPI
 from .downloader import AudioDownloader, QualityPreset
-from .job_manager import JobManager, JobStatus
+from .job_manager import JobManager, JobStatus, TERMINAL_STATUSES
+from .job_store import JobStore
+from .job_stream import JobWatch
+from .loop_monitor import LoopMonitor
+from .storage import StorageManager
+from .startup import StartupReport, Prewarmer
+from .prefetch import SpeculativeResolver
+from .work_queue import WorkQueue
+from .http_cache import cached_json
+from .export import archive_names, stream_zip
+
+startup_report = StartupReport(started=IMPORT_STARTED)
+startup_report.record("imports", time.perf_counter() - IMPORT_STARTED)
 
 app = FastAPI(title="Spowlo Music API", version="1.0.0")
 
@@ -28,16 +47,82 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Initialize components
+components_started = time.perf_counter()
+# Upstream endpoints can be pointed at local stand-ins (see benchmarks/)
 spotify_api = SpotifyAPI(
     client_id="2079ef31b1bb4feaaaa811d9f280faef",
-    client_secret="2e76121a91864d41a768ba1eaf80610e"
+    client_secret="2e76121a91864d41a768ba1eaf80610e",
+    auth_url=os.getenv("SPOTIFY_AUTH_URL", "https://accounts.spotify.com/api/token"),
+    api_base=os.getenv("SPOTIFY_API_BASE", "https://api.spotify.com")
+)
+jiosaavn_api = JioSaavnAPI(
+    api_url=os.getenv("JIOSAAVN_API_URL", "https://www.jiosaavn.com/api.php")
+)
+downloader = AudioDownloader(output_dir=os.getenv("DOWNLOADS_DIR", "downloads"))
+# Jobs are persisted so they survive restarts; set JOBS_DB="" to keep them in memory only
+JOBS_DB = os.getenv("JOBS_DB", "jobs.db")
+job_manager = JobManager(
+    store=JobStore(JOBS_DB) if JOBS_DB else None,
+    persist_interval=float(os.getenv("JOB_PERSIST_INTERVAL_S", "2")),
+    retention=float(os.getenv("JOB_RETENTION_S", str(7 * 24 * 3600)))
 )
-jiosaavn_api = JioSaavnAPI()
-downloader = AudioDownloader(output_dir="downloads")
-job_manager = JobManager()
+resumed_tasks = set()
+
+# "inline" runs downloads in this process; "queue" hands them to app.worker processes
+DOWNLOAD_MODE = os.getenv("DOWNLOAD_MODE", "inline")
+JOB_SYNC_INTERVAL = float(os.getenv("JOB_SYNC_INTERVAL_MS", "500")) / 1000
+work_queue = None
+if DOWNLOAD_MODE == "queue":
+    if not JOBS_DB:
+        raise RuntimeError("DOWNLOAD_MODE=queue requires JOBS_DB")
+    work_queue = WorkQueue(JOBS_DB, lease_seconds=float(os.getenv("WORKER_LEASE_S", "60")))
+loop_monitor = LoopMonitor(
+    interval=float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100")) / 1000,
+    threshold=float(os.getenv("LOOP_LAG_THRESHOLD_MS", "250")) / 1000
+)
+
+storage = StorageManager(
+    directory=downloader.output_dir,
+    quota_bytes=int(os.getenv("DOWNLOADS_QUOTA_BYTES", "0")),
+    min_free_bytes=int(os.getenv("DOWNLOADS_MIN_FREE_BYTES", str(256 * 1024 * 1024))),
+    grace_seconds=float(os.getenv("STORAGE_GRACE_S", "900"))
+)
+STORAGE_SWEEP_INTERVAL = float(os.getenv("STORAGE_SWEEP_INTERVAL_S", "60"))
+
+# Opt-in speculative resolution of the YouTube source when metadata is fetched
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "0") == "1"
+PREFETCH_MAX_ACTIVE_DOWNLOADS = int(os.getenv("PREFETCH_MAX_ACTIVE_DOWNLOADS", "4"))
+PREFETCH_MAX_LOOP_LAG = float(os.getenv("PREFETCH_MAX_LOOP_LAG_MS", "100")) / 1000
+resolver = SpeculativeResolver(
+    downloader.resolve_best_match,
+    ttl=float(os.getenv("PREFETCH_TTL_S", "120")),
+    max_pending=int(os.getenv("PREFETCH_MAX_PENDING", "8"))
+)
+active_downloads = 0
+# Search results ranked against track metadata before picking one to download
+SEARCH_CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", "5"))
+startup_report.record("components", time.perf_counter() - components_started)
+
+# Heavy imports are deferred to first use; pre-warm them once the server is up
+PREWARM = os.getenv("PREWARM", "1") != "0"
+PREWARM_DELAY = float(os.getenv("PREWARM_DELAY_S", "0.5"))
+prewarmer = Prewarmer(startup_report, [
+    ("import requests", lambda: importlib.import_module("requests")),
+    ("load yt-dlp extractors", AudioDownloader.prewarm),
+])
+
+# Metadata rarely changes; let clients and proxies reuse it
+METADATA_CACHE_CONTROL = f"public, max-age={int(os.getenv('METADATA_MAX_AGE_S', '3600'))}"
+# Job ETags are versions, which are only unique within one server lifetime
+ETAG_EPOCH = uuid.uuid4().hex[:8]
+
+# Multiplexed job streams batch all changes into one message per tick
+JOB_STREAM_TICK = float(os.getenv("JOB_STREAM_TICK_MS", "500")) / 1000
+JOB_STREAM_KEEPALIVE = 15.0
 
 
 class Platform(str, Enum):
@@ -66,6 +151,7 @@ class DownloadRequest(BaseModel):
     url: str
     quality: Quality
     metadata: Optional[TrackMetadata] = None
+    client_id: Optional[str] = None
 
 
 class DownloadResponse(BaseModel):
@@ -83,6 +169,195 @@ class JobProgressResponse(BaseModel):
     result_file: Optional[str] = None
 
 
+class JobSummary(BaseModel):
+    job_id: str
+    url: str
+    platform: Optional[Platform] = None
+    status: JobStatus
+    progress: float
+    error: Optional[str] = None
+    result_file: Optional[str] = None
+    metadata: Optional[TrackMetadata] = None
+    created_at: str
+    updated_at: str
+
+
+class JobListResponse(BaseModel):
+    jobs: List[JobSummary]
+    next_cursor: Optional[str] = None
+
+
+class ExportRequest(BaseModel):
+    job_ids: List[str]
+
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    """Start event-loop lag monitoring unless disabled"""
+    if os.getenv("LOOP_MONITOR", "1") != "0":
+        await loop_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await loop_monitor.stop()
+
+
+@app.on_event("startup")
+async def resume_unfinished_jobs():
+    """Re-queue jobs that were still running when the process stopped
+    
+    A job that had resolved its source restarts from that URL, so yt-dlp
+    finds the same .part file and continues it with a Range request.
+    """
+    with startup_report.phase("restore jobs"):
+        unfinished = job_manager.restore()
+    
+    if work_queue:
+        # Unfinished jobs are still in the queue; workers reclaim expired leases
+        return
+    
+    for job in unfinished:
+        metadata = job.get('metadata')
+        if isinstance(metadata, dict):
+            metadata = TrackMetadata(**metadata)
+        
+        current_line = "Re-queued after restart"
+        partial_file = job.get('partial_file')
+        if partial_file and os.path.exists(partial_file):
+            current_line = f"Resuming from byte {os.path.getsize(partial_file)} after restart"
+        job_manager.update_job(job['job_id'], status=JobStatus.PENDING, current_line=current_line)
+        
+        task = asyncio.create_task(process_download(
+            job_id=job['job_id'],
+            url=job.get('source_url') or job['url'],
+            quality=Quality(job['quality']),
+            metadata=metadata
+        ))
+        resumed_tasks.add(task)
+        task.add_done_callback(resumed_tasks.discard)
+
+
+def active_job_files(exclude_job_id: Optional[str] = None) -> List[str]:
+    """Result and partial files recorded by unfinished jobs
+    
+    The store is read as well, so jobs run by other worker processes count.
+    """
+    jobs = {}
+    if job_manager.store:
+        jobs = {job['job_id']: job for job in job_manager.store.load_unfinished()}
+    for job in list(job_manager.jobs.values()):
+        jobs[job['job_id']] = job
+    
+    files = []
+    for job in jobs.values():
+        if job['job_id'] == exclude_job_id or job['status'] in TERMINAL_STATUSES:
+            continue
+        files.extend(path for path in (job.get('result_file'), job.get('partial_file')) if path)
+        if (job.get('partial_file') or '').endswith('.part'):
+            # The finished download awaiting conversion
+            files.append(job['partial_file'][:-len('.part')])
+    return files
+
+
+def run_storage_sweep() -> Dict:
+    """Sweep the downloads directory, keeping active jobs' files"""
+    report = storage.sweep(pinned=active_job_files())
+    
+    if report['evicted']:
+        evicted = {os.path.abspath(path) for path in report['evicted']}
+        for job in list(job_manager.jobs.values()):
+            if job.get('result_file') and os.path.abspath(job['result_file']) in evicted:
+                job_manager.update_job(
+                    job['job_id'],
+                    current_line="Result file evicted to free disk space"
+                )
+    return report
+
+
+@app.on_event("startup")
+async def start_storage_sweeper():
+    """Periodically reap temp files, enforce the downloads quota and prune old jobs"""
+    async def sweeper():
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, run_storage_sweep)
+            except Exception as e:
+                print(f"Storage sweep failed: {e}")
+            try:
+                pruned = job_manager.prune()
+                if pruned:
+                    print(f"Pruned {pruned} finished jobs past retention")
+            except Exception as e:
+                print(f"Job prune failed: {e}")
+            await asyncio.sleep(STORAGE_SWEEP_INTERVAL)
+    
+    app.state.storage_sweeper = asyncio.create_task(sweeper())
+
+
+@app.on_event("shutdown")
+async def stop_storage_sweeper():
+    app.state.storage_sweeper.cancel()
+    try:
+        await app.state.storage_sweeper
+    except asyncio.CancelledError:
+        pass
+
+
+@app.on_event("shutdown")
+async def stop_resolver():
+    resolver.shutdown()
+
+
+@app.on_event("startup")
+async def start_job_sync():
+    """In queue mode, pull progress written by workers into memory"""
+    if not work_queue:
+        return
+    
+    async def sync():
+        loop = asyncio.get_running_loop()
+        # Store sequence numbers, not timestamps: a slow write can commit after a
+        # later one, and worker clocks may disagree. restore() already loaded
+        # everything up to restored_seq
+        cursor = job_manager.restored_seq
+        while True:
+            try:
+                updated, cursor = await loop.run_in_executor(
+                    None, job_manager.store.changed_since, cursor
+                )
+                for job in updated:
+                    current = job_manager.get_job(job['job_id'])
+                    if not current or job['version'] > current['version']:
+                        job_manager.apply(job)
+            except Exception as e:
+                print(f"Job sync failed: {e}")
+            await asyncio.sleep(JOB_SYNC_INTERVAL)
+    
+    app.state.job_sync = asyncio.create_task(sync())
+
+
+@app.on_event("shutdown")
+async def stop_job_sync():
+    if not work_queue:
+        return
+    app.state.job_sync.cancel()
+    try:
+        await app.state.job_sync
+    except asyncio.CancelledError:
+        pass
+
+
+@app.on_event("startup")
+async def finish_startup():
+    """Report startup time and schedule pre-warming (keep this handler last)"""
+    startup_report.mark_ready()
+    print(startup_report.summary())
+    if PREWARM:
+        asyncio.get_running_loop().call_later(PREWARM_DELAY, prewarmer.start)
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -93,9 +368,29 @@ async def root():
     }
 
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Runtime metrics for this worker process"""
+    return {
+        "event_loop": loop_monitor.snapshot(),
+        "storage": storage.snapshot(),
+        "startup": startup_report.snapshot(),
+        "prefetch": resolver.snapshot(),
+        "queue": {
+            "mode": DOWNLOAD_MODE,
+            **(work_queue.stats() if work_queue else {})
+        }
+    }
+
+
 @app.get("/api/metadata/spotify/{track_id}")
-async def get_spotify_metadata(track_id: str):
-    """Get metadata for a Spotify track"""
+async def get_spotify_metadata(request: Request, track_id: str, prefetch: Optional[bool] = None):
+    """Get metadata for a Spotify track
+    
+    With prefetch (or SPECULATIVE_PREFETCH=1) the YouTube source for the
+    track is resolved in the background so a following download starts
+    immediately. Only in DOWNLOAD_MODE=inline.
+    """
     try:
         # Construct full URL if only ID is provided
         if not track_id.startswith("http"):
@@ -119,7 +414,7 @@ async def get_spotify_metadata(track_id: str):
         if images:
             thumbnail_url = images[0]['url']
         
-        return TrackMetadata(
+        metadata = TrackMetadata(
             id=track_id,
             title=track_name,
             artists=artists,
@@ -128,13 +423,23 @@ async def get_spotify_metadata(track_id: str):
             duration=duration_ms // 1000,  # Convert to seconds
             platform=Platform.SPOTIFY
         )
+        
+        # Workers can't see this process's cache, so queue mode never prefetches
+        if not work_queue and (prefetch or (prefetch is None and SPECULATIVE_PREFETCH)):
+            resolver.schedule(
+                f"{track_name} {' '.join(artists)}",
+                metadata.model_dump(),
+                SEARCH_CANDIDATES,
+                under_load=under_load()
+            )
+        return cached_json(request, metadata, cache_control=METADATA_CACHE_CONTROL)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/metadata/jiosaavn/{song_id}")
-async def get_jiosaavn_metadata(song_id: str):
+async def get_jiosaavn_metadata(request: Request, song_id: str):
     """Get metadata for a JioSaavn song"""
     try:
         # Construct full URL if only ID is provided
@@ -163,7 +468,7 @@ async def get_jiosaavn_metadata(song_id: str):
         thumbnail = song_details.get('image', 
                                     song_details.get('media_preview_url', None))
         
-        return TrackMetadata(
+        metadata = TrackMetadata(
             id=song_id,
             title=title,
             artists=artists,
@@ -172,6 +477,7 @@ async def get_jiosaavn_metadata(song_id: str):
             duration=duration,
             platform=Platform.JIOSAAVN
         )
+        return cached_json(request, metadata, cache_control=METADATA_CACHE_CONTROL)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -180,6 +486,19 @@ async def get_jiosaavn_metadata(song_id: str):
 @app.post("/api/download", response_model=DownloadResponse)
 async def start_download(request: DownloadRequest, background_tasks: BackgroundTasks):
     """Start a download job"""
+    if not storage.has_capacity():
+        # Stats may be stale; sweep once before turning the client away
+        await asyncio.get_running_loop().run_in_executor(None, run_storage_sweep)
+        if not storage.has_capacity():
+            raise HTTPException(
+                status_code=507,
+                detail="Insufficient storage, try again later"
+            )
+    
+    if under_load():
+        # Real work takes priority over speculative resolution
+        resolver.cancel_all()
+    
     try:
         job_id = str(uuid.uuid4())
         
@@ -188,17 +507,27 @@ async def start_download(request: DownloadRequest, background_tasks: BackgroundT
             job_id=job_id,
             url=request.url,
             quality=request.quality,
-            metadata=request.metadata
+            metadata=request.metadata,
+            client_id=request.client_id,
+            platform=detect_url_type(request.url).value
         )
         
-        # Start download in background
-        background_tasks.add_task(
-            process_download,
-            job_id=job_id,
-            url=request.url,
-            quality=request.quality,
-            metadata=request.metadata
-        )
+        if work_queue:
+            # Hand off to a worker process (python -m app.worker)
+            work_queue.enqueue(job_id, {
+                'url': request.url,
+                'quality': request.quality.value,
+                'metadata': request.metadata.model_dump(mode='json') if request.metadata else None
+            })
+        else:
+            # Start download in background
+            background_tasks.add_task(
+                process_download,
+                job_id=job_id,
+                url=request.url,
+                quality=request.quality,
+                metadata=request.metadata
+            )
         
         return DownloadResponse(
             job_id=job_id,
@@ -217,6 +546,8 @@ async def process_download(
     metadata: Optional[TrackMetadata]
 ):
     """Process download job"""
+    global active_downloads
+    active_downloads += 1
     try:
         # Determine quality preset
         quality_choice = '1'  # Default M4A 320kbps
@@ -252,6 +583,8 @@ async def process_download(
             error=str(e),
             current_line=f"Error: {str(e)}"
         )
+    finally:
+        active_downloads -= 1
 
 
 async def process_jiosaavn_download(
@@ -275,10 +608,18 @@ async def process_jiosaavn_download(
             job_id=job_id,
             progress_callback=lambda prog, line: job_manager.update_job(
                 job_id, progress=prog, current_line=line
+            ),
+            state_callback=lambda partial, source: job_manager.update_job(
+                job_id, partial_file=partial, source_url=source
             )
         )
         
         if result['success']:
+            storage.reap_leftovers(
+                result.get('filename'),
+                result.get('source_files', []),
+                protected=active_job_files(exclude_job_id=job_id)
+            )
             job_manager.update_job(
                 job_id,
                 status=JobStatus.COMPLETED,
@@ -348,10 +689,18 @@ async def process_youtube_download(
             current_line=f"Downloading from YouTube: {search_query}"
         )
         
-        # If it's a search query, prepend ytsearch
         url = search_query
+        info = None
         if not search_query.startswith('http'):
-            url = f"ytsearch1:{search_query}"
+            # Use a speculatively resolved source if one is ready or in flight
+            info = await resolver.take(search_query)
+            if info:
+                job_manager.update_job(
+                    job_id,
+                    current_line=f"Using prefetched source: {info.get('title', search_query)}"
+                )
+            else:
+                url = await find_youtube_source(job_id, search_query, metadata)
         
         result = await downloader.download_youtube(
             url=url,
@@ -360,10 +709,19 @@ async def process_youtube_download(
             metadata=metadata,
             progress_callback=lambda prog, line: job_manager.update_job(
                 job_id, progress=prog, current_line=line
-            )
+            ),
+            state_callback=lambda partial, source: job_manager.update_job(
+                job_id, partial_file=partial, source_url=source
+            ),
+            info=info
         )
         
         if result['success']:
+            storage.reap_leftovers(
+                result.get('filename'),
+                result.get('source_files', []),
+                protected=active_job_files(exclude_job_id=job_id)
+            )
             job_manager.update_job(
                 job_id,
                 status=JobStatus.COMPLETED,
@@ -378,6 +736,44 @@ async def process_youtube_download(
         raise Exception(f"YouTube download failed: {str(e)}")
 
 
+async def find_youtube_source(
+    job_id: str,
+    search_query: str,
+    metadata: Optional[TrackMetadata]
+) -> str:
+    """Pick the search result that best matches the track
+    
+    Falls back to the first search hit if the ranked search fails.
+    """
+    job_manager.update_job(
+        job_id,
+        current_line=f"Ranking top {SEARCH_CANDIDATES} YouTube results for: {search_query}"
+    )
+    try:
+        source = await asyncio.get_running_loop().run_in_executor(
+            None,
+            downloader.find_best_match,
+            search_query,
+            metadata.model_dump() if metadata else None,
+            SEARCH_CANDIDATES
+        )
+    except Exception as e:
+        print(f"Ranked search failed for {search_query!r}: {e}")
+        source = None
+    return source or youtube_search_url(search_query)
+
+
+def youtube_search_url(search_query: str) -> str:
+    """yt-dlp URL for the first search hit"""
+    return f"ytsearch1:{search_query}"
+
+
+def under_load() -> bool:
+    """Whether speculative work should yield to real downloads"""
+    lag = loop_monitor.lags[-1] if loop_monitor.lags else 0.0
+    return active_downloads >= PREFETCH_MAX_ACTIVE_DOWNLOADS or lag >= PREFETCH_MAX_LOOP_LAG
+
+
 def detect_url_type(url: str) -> Platform:
     """Detect platform from URL"""
     if 'spotify.com' in url:
@@ -389,19 +785,140 @@ def detect_url_type(url: str) -> Platform:
 
 
 @app.get("/api/job/{job_id}", response_model=JobProgressResponse)
-async def get_job_status(job_id: str):
-    """Get status of a download job"""
+async def get_job_status(request: Request, job_id: str):
+    """Get status of a download job
+    
+    Polling clients should send If-None-Match with the last ETag; an
+    unchanged job is answered with 304 and no body.
+    """
     job = job_manager.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return JobProgressResponse(
-        job_id=job_id,
-        status=job['status'],
-        progress=job['progress'],
-        current_line=job['current_line'],
-        error=job.get('error'),
-        result_file=job.get('result_file')
+    return cached_json(
+        request,
+        JobProgressResponse(
+            job_id=job_id,
+            status=job['status'],
+            progress=job['progress'],
+            current_line=job['current_line'],
+            error=job.get('error'),
+            result_file=job.get('result_file')
+        ),
+        etag=f'"{ETAG_EPOCH}-{job["version"]}"'
+    )
+
+
+@app.get("/api/jobs", response_model=JobListResponse)
+async def list_jobs(
+    status: Optional[JobStatus] = None,
+    platform: Optional[Platform] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200)
+):
+    """List jobs newest first
+    
+    Pass next_cursor from a response as cursor to get the following page.
+    """
+    after = decode_job_cursor(cursor) if cursor else None
+    jobs = job_manager.query_jobs(
+        status=status,
+        platform=platform.value if platform else None,
+        created_after=local_timestamp(created_after),
+        created_before=local_timestamp(created_before),
+        after=after,
+        limit=limit + 1
+    )
+    
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = encode_job_cursor(jobs[-1])
+    
+    return JobListResponse(
+        jobs=[
+            JobSummary(
+                job_id=job['job_id'],
+                url=job['url'],
+                platform=job.get('platform'),
+                status=job['status'],
+                progress=job['progress'],
+                error=job.get('error'),
+                result_file=job.get('result_file'),
+                metadata=job.get('metadata'),
+                created_at=job['created_at'],
+                updated_at=job['updated_at']
+            )
+            for job in jobs
+        ],
+        next_cursor=next_cursor
+    )
+
+
+def encode_job_cursor(job: Dict) -> str:
+    key = f"{job['created_at']}|{job['job_id']}"
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+
+def decode_job_cursor(cursor: str):
+    try:
+        key = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, job_id = key.split('|', 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return (created_at, job_id)
+
+
+def local_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """Match the naive local-time ISO timestamps jobs are created with"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+
+@app.post("/api/export")
+async def export_jobs(request: ExportRequest):
+    """Stream the results of completed jobs as one ZIP archive
+    
+    Entries are stored uncompressed and the archive is produced while it
+    is sent, so neither memory nor disk holds a copy of it.
+    """
+    job_ids = list(dict.fromkeys(request.job_ids))
+    if not job_ids:
+        raise HTTPException(status_code=400, detail="No job ids given")
+    
+    paths = []
+    for job_id in job_ids:
+        job = job_manager.get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+        result_file = job.get('result_file')
+        if job['status'] != JobStatus.COMPLETED or not result_file or not os.path.isfile(result_file):
+            raise HTTPException(status_code=409, detail=f"Job has no downloadable result: {job_id}")
+        paths.append(result_file)
+    
+    files = archive_names(paths)
+    for path in paths:
+        storage.touch(path)
+    
+    def archive():
+        # Keep the files from being evicted while they are streamed
+        for path in paths:
+            storage.pin(path)
+        try:
+            yield from stream_zip(files)
+        finally:
+            for path in paths:
+                storage.unpin(path)
+    
+    return StreamingResponse(
+        archive(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="spowlo-export.zip"'}
     )
 
 
@@ -423,7 +940,6 @@ async def job_events(job_id: str):
             # Send update if changed
             current_update = (job['status'], job['progress'], job['current_line'])
             if current_update != last_update:
-                import json
                 data = {
                     'status': job['status'].value,
                     'progress': job['progress'],
@@ -435,7 +951,7 @@ async def job_events(job_id: str):
                 last_update = current_update
             
             # Stop if job is terminal
-            if job['status'] in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]:
+            if job['status'] in TERMINAL_STATUSES:
                 break
             
             await asyncio.sleep(0.5)
@@ -443,6 +959,95 @@ async def job_events(job_id: str):
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 
+def parse_job_ids(ids: Optional[str]) -> List[str]:
+    """Split a comma-separated job id list"""
+    if not ids:
+        return []
+    return [job_id.strip() for job_id in ids.split(',') if job_id.strip()]
+
+
+def is_id_list(value) -> bool:
+    """Whether a WebSocket command value is a list of job id strings"""
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+@app.get("/api/jobs/events")
+async def jobs_events(ids: Optional[str] = None, client_id: Optional[str] = None):
+    """Server-Sent Events stream of batched deltas for many jobs
+
+    Subscribe with ?ids=a,b,c and/or ?client_id=... (all jobs of a client).
+    Each event is {"jobs": {job_id: {changed fields}}}.
+    """
+    job_ids = parse_job_ids(ids)
+    if not job_ids and not client_id:
+        raise HTTPException(status_code=400, detail="Provide ids or client_id")
+    
+    async def event_generator():
+        watch = JobWatch(job_manager, job_ids=job_ids, client_id=client_id)
+        idle = 0.0
+        while True:
+            deltas = watch.poll()
+            if deltas:
+                yield f"data: {json.dumps({'jobs': deltas}, separators=(',', ':'))}\n\n"
+                idle = 0.0
+            elif idle >= JOB_STREAM_KEEPALIVE:
+                yield ": keepalive\n\n"
+                idle = 0.0
+            
+            if watch.finished():
+                break
+            
+            await asyncio.sleep(JOB_STREAM_TICK)
+            idle += JOB_STREAM_TICK
+    
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+@app.websocket("/api/jobs/ws")
+async def jobs_websocket(websocket: WebSocket):
+    """WebSocket stream of batched deltas for many jobs
+    
+    Client messages: {"subscribe": [ids]}, {"unsubscribe": [ids]},
+    {"client_id": "..."}. Server messages: {"jobs": {job_id: {changed fields}}}.
+    """
+    await websocket.accept()
+    watch = JobWatch(
+        job_manager,
+        job_ids=parse_job_ids(websocket.query_params.get('ids')),
+        client_id=websocket.query_params.get('client_id')
+    )
+    
+    async def receive_commands():
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except WebSocketDisconnect:
+                return
+            except ValueError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            # Malformed commands are ignored, like malformed JSON
+            if is_id_list(message.get('subscribe')):
+                watch.subscribe(message['subscribe'])
+            if is_id_list(message.get('unsubscribe')):
+                watch.unsubscribe(message['unsubscribe'])
+            if 'client_id' in message and isinstance(message['client_id'], (str, type(None))):
+                watch.client_id = message['client_id'] or None
+    
+    receiver = asyncio.create_task(receive_commands())
+    try:
+        while not receiver.done():
+            deltas = watch.poll()
+            if deltas:
+                await websocket.send_text(json.dumps({'jobs': deltas}, separators=(',', ':')))
+            await asyncio.wait({receiver}, timeout=JOB_STREAM_TICK)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,94 @@
+"""Search Matching - rank YouTube search results against track metadata"""
+import re
+import unicodedata
+from typing import Dict, List, Optional, Set
+
+
+# Versions that are rarely what a Spotify/JioSaavn track refers to
+UNWANTED_TERMS = (
+    'live', 'cover', 'remix', 'karaoke', 'instrumental', 'acoustic',
+    'nightcore', 'slowed', 'reverb', 'sped up', '8d', 'reaction', 'mashup',
+)
+
+TITLE_WEIGHT = 0.4
+ARTIST_WEIGHT = 0.25
+DURATION_WEIGHT = 0.35
+
+# Duration within this many seconds counts as a perfect match...
+DURATION_TOLERANCE = 3
+# ...and this far off scores zero; anything further is penalized
+DURATION_LIMIT = 30
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^\w]+', ' ', text.lower()).split())
+
+
+def tokens(text: str) -> Set[str]:
+    return set(normalize(text).split())
+
+
+def has_term(text: str, term: str) -> bool:
+    return re.search(rf'\b{re.escape(term)}\b', text) is not None
+
+
+def score_candidate(
+    candidate: Dict,
+    title: str,
+    artists: List[str],
+    duration: Optional[float] = None
+) -> float:
+    """Score a flat search entry; higher is a better match"""
+    candidate_title = normalize(candidate.get('title'))
+    channel = normalize(candidate.get('channel') or candidate.get('uploader'))
+    text = f"{candidate_title} {channel}"
+    expected_title = normalize(title)
+
+    expected = tokens(title)
+    title_score = len(expected & set(text.split())) / len(expected) if expected else 0.0
+
+    names = [normalize(artist) for artist in artists if normalize(artist)]
+    artist_score = sum(1 for name in names if name in text) / len(names) if names else 0.0
+
+    score = TITLE_WEIGHT * title_score + ARTIST_WEIGHT * artist_score
+
+    candidate_duration = candidate.get('duration')
+    if duration and candidate_duration:
+        off = abs(candidate_duration - duration)
+        if off <= DURATION_TOLERANCE:
+            score += DURATION_WEIGHT
+        elif off <= DURATION_LIMIT:
+            score += DURATION_WEIGHT * (DURATION_LIMIT - off) / (DURATION_LIMIT - DURATION_TOLERANCE)
+        else:
+            # Long videos, compilations and extended mixes
+            score -= DURATION_WEIGHT * min(off / duration, 1.0)
+
+    for term in UNWANTED_TERMS:
+        if has_term(candidate_title, term) and not has_term(expected_title, term):
+            score -= 0.3
+    if candidate.get('live_status') in ('is_live', 'was_live', 'is_upcoming'):
+        score -= 0.5
+
+    # Auto-generated "Artist - Topic" channels carry the studio recording
+    if channel.endswith(' topic'):
+        score += 0.1
+
+    return score
+
+
+def best_match(
+    candidates: List[Dict],
+    title: str,
+    artists: List[str],
+    duration: Optional[float] = None
+) -> Optional[Dict]:
+    """Pick the best candidate, preferring the higher search rank on ties"""
+    best, best_score = None, None
+    for rank, candidate in enumerate(candidates):
+        score = score_candidate(candidate, title, artists, duration) - 0.01 * rank
+        if best_score is None or score > best_score:
+            best, best_score = candidate, score
+    return best
@@ -0,0 +1,139 @@
+"""Speculative prefetch of download source resolution"""
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+
+class SpeculativeResolver:
+    """Resolve a likely download target before the download is requested
+
+    Resolution (search, extraction, format selection) runs on a dedicated
+    low-priority executor so it never competes with real downloads for the
+    default pool. Results are kept in a short-lived cache and handed out
+    once; anything still queued or running is dropped under load.
+
+    A download only ever waits for a resolution that is already running.
+    One still queued behind other speculative work is cancelled, and the
+    caller resolves inline instead.
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[..., Optional[Dict]],
+        ttl: float = 120.0,
+        max_entries: int = 256,
+        max_pending: int = 8,
+        workers: int = 1
+    ):
+        self.resolve = resolve
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self.cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self.pending: Dict[str, Future] = {}
+        self.stats = {
+            'scheduled': 0,
+            'skipped_under_load': 0,
+            'skipped_backlog': 0,
+            'cancelled': 0,
+            'failed': 0,
+            'hits': 0,
+            'misses': 0,
+        }
+
+    def schedule(self, target: str, *args, under_load: bool = False):
+        """Start resolving target in the background unless already known
+
+        Extra args are passed on to resolve after target.
+        """
+        if under_load:
+            self.stats['skipped_under_load'] += 1
+            return
+        self._expire()
+        if target in self.cache or target in self.pending:
+            return
+        if len(self.pending) >= self.max_pending:
+            self.stats['skipped_backlog'] += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        future = self.executor.submit(self.resolve, target, *args)
+        self.pending[target] = future
+        self.stats['scheduled'] += 1
+
+        def done(fut: Future):
+            if self.pending.get(target) is not fut:
+                # Dropped by take() or cancel_all()
+                return
+            del self.pending[target]
+            if fut.cancelled():
+                return
+            if fut.exception() or not fut.result():
+                self.stats['failed'] += 1
+                return
+            self.cache[target] = (time.monotonic() + self.ttl, fut.result())
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+
+        def finished(fut: Future):
+            try:
+                loop.call_soon_threadsafe(done, fut)
+            except RuntimeError:
+                pass  # loop already closed
+
+        future.add_done_callback(finished)
+
+    async def take(self, target: str) -> Optional[Dict]:
+        """Hand out a resolved info dict for target, waiting only if it is running"""
+        self._expire()
+        entry = self.cache.pop(target, None)
+        if entry:
+            self.stats['hits'] += 1
+            return entry[1]
+
+        future = self.pending.pop(target, None)
+        if future and future.cancel():
+            # Still queued behind other speculative work; resolving inline is faster
+            self.stats['cancelled'] += 1
+        elif future:
+            try:
+                info = await asyncio.wrap_future(future)
+            except Exception:
+                info = None
+            if info:
+                self.stats['hits'] += 1
+                return info
+
+        self.stats['misses'] += 1
+        return None
+
+    def cancel_all(self):
+        """Drop queued and in-flight speculative work
+
+        A resolution already running in a thread finishes in the background
+        but its result is discarded; queued ones never start.
+        """
+        for future in list(self.pending.values()):
+            if future.cancel():
+                self.stats['cancelled'] += 1
+        self.pending.clear()
+
+    def _expire(self):
+        now = time.monotonic()
+        for target in [t for t, (expires, _) in self.cache.items() if expires <= now]:
+            del self.cache[target]
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> Dict:
+        self._expire()
+        return {
+            'cached': len(self.cache),
+            'in_flight': len(self.pending),
+            **self.stats,
+        }
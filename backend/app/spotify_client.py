@@ -1,20 +1,26 @@
 """Spotify API Client - Replicates logic from spoti-down-m4a-opus-v4.2.py"""
 import base64
-import requests
 from typing import Optional, Dict
 
 
 class SpotifyAPI:
     """Handle Spotify API authentication and data fetching"""
     
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        auth_url: str = "https://accounts.spotify.com/api/token",
+        api_base: str = "https://api.spotify.com"
+    ):
         self.client_id = client_id
         self.client_secret = client_secret
+        self.auth_url = auth_url
+        self.api_base = api_base.rstrip('/')
         self.access_token = None
         
     def get_access_token(self) -> bool:
         """Get Spotify API access token"""
-        auth_url = "https://accounts.spotify.com/api/token"
         auth_header = base64.b64encode(
             f"{self.client_id}:{self.client_secret}".encode()
         ).decode()
@@ -27,7 +33,8 @@ class SpotifyAPI:
         data = {"grant_type": "client_credentials"}
         
         try:
-            response = requests.post(auth_url, headers=headers, data=data, timeout=10)
+            import requests  # deferred to keep startup fast
+            response = requests.post(self.auth_url, headers=headers, data=data, timeout=10)
             response.raise_for_status()
             self.access_token = response.json()["access_token"]
             return True
@@ -44,10 +51,11 @@ class SpotifyAPI:
         # Extract track ID from URL
         track_id = track_url.split("/track/")[-1].split("?")[0]
         
-        api_url = f"https://api.spotify.com/v1/tracks/{track_id}"
+        api_url = f"{self.api_base}/v1/tracks/{track_id}"
         headers = {"Authorization": f"Bearer {self.access_token}"}
         
         try:
+            import requests
             response = requests.get(api_url, headers=headers, timeout=10)
             response.raise_for_status()
             return response.json()
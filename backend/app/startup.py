@@ -0,0 +1,79 @@
+"""Startup timing report and background pre-warming of heavy imports"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class StartupReport:
+    """Record how long each startup phase took
+
+    Background work (pre-warming) is recorded separately since it overlaps
+    with serving requests.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases: List[Dict] = []
+        self.background: List[Dict] = []
+        self.ready_ms: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        self.phases.append({'name': name, 'ms': round(seconds * 1000, 1)})
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as a startup phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def mark_ready(self):
+        self.ready_ms = round((time.perf_counter() - self.started) * 1000, 1)
+
+    def record_background(self, name: str, seconds: float, error: Optional[str] = None):
+        with self._lock:
+            self.background.append({
+                'name': name,
+                'ms': round(seconds * 1000, 1),
+                'error': error,
+            })
+
+    def summary(self) -> str:
+        phases = ', '.join(f"{p['name']} {p['ms']:.0f}ms" for p in self.phases)
+        return f"Startup ready in {self.ready_ms:.0f}ms ({phases})"
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            background = list(self.background)
+        return {
+            'ready_ms': self.ready_ms,
+            'phases': list(self.phases),
+            'background': background,
+        }
+
+
+class Prewarmer:
+    """Run warm-up tasks on a daemon thread so requests don't pay for them"""
+
+    def __init__(self, report: StartupReport, tasks: List[Tuple[str, Callable]]):
+        self.report = report
+        self.tasks = tasks
+        self.done = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name="prewarm", daemon=True).start()
+
+    def _run(self):
+        for name, task in self.tasks:
+            started = time.perf_counter()
+            error = None
+            try:
+                task()
+            except Exception as e:
+                error = str(e)
+            self.report.record_background(name, time.perf_counter() - started, error)
+        self.done.set()
@@ -0,0 +1,221 @@
+"""Storage Manager - keeps the downloads directory within its disk budget"""
+import fnmatch
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class StorageManager:
+    """Enforce a byte quota on the downloads directory
+
+    Completed results are evicted least-recently-used first once the quota
+    or the free-space floor is crossed. Temp and partial files left by
+    yt-dlp and ffmpeg are reaped once they are older than the grace period.
+    Anything pinned (results of active jobs, files being exported) or
+    modified within the grace period is never touched.
+    """
+
+    TEMP_PATTERNS = (
+        '*.part',
+        '*.part-Frag*',
+        '*.ytdl',
+        '*.temp',
+        '*.tmp',
+        '*_tagged.*',
+        'cover_temp.jpg',
+    )
+
+    def __init__(
+        self,
+        directory: str,
+        quota_bytes: int = 0,
+        min_free_bytes: int = 0,
+        grace_seconds: float = 900.0
+    ):
+        self.directory = directory
+        self.quota_bytes = quota_bytes
+        self.min_free_bytes = min_free_bytes
+        self.grace_seconds = grace_seconds
+
+        self.last_access: Dict[str, float] = {}
+        self.pins: Dict[str, int] = {}
+        self.used_bytes = 0
+        self.file_count = 0
+        self.last_sweep: Optional[float] = None
+        self.reaped_total = 0
+        self.evicted_total = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def is_temp(self, path: str) -> bool:
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.TEMP_PATTERNS)
+
+    def touch(self, path: str):
+        """Record an access so the file moves to the back of the LRU order"""
+        with self._lock:
+            self.last_access[self._key(path)] = time.time()
+
+    def pin(self, path: str):
+        """Protect a file from eviction until unpin() is called"""
+        key = self._key(path)
+        with self._lock:
+            self.pins[key] = self.pins.get(key, 0) + 1
+
+    def unpin(self, path: str):
+        key = self._key(path)
+        with self._lock:
+            count = self.pins.get(key, 0) - 1
+            if count > 0:
+                self.pins[key] = count
+            else:
+                self.pins.pop(key, None)
+
+    def free_bytes(self) -> int:
+        try:
+            return shutil.disk_usage(self.directory).free
+        except OSError:
+            return 0
+
+    def has_capacity(self) -> bool:
+        """Whether there is room to admit another download"""
+        if self.min_free_bytes and self.free_bytes() < self.min_free_bytes:
+            return False
+        if self.quota_bytes and self.used_bytes >= self.quota_bytes:
+            return False
+        return True
+
+    def reap_leftovers(
+        self,
+        result_file: str,
+        source_files: Iterable[str],
+        protected: Iterable[str] = ()
+    ) -> List[str]:
+        """Remove the source files a finished download kept next to its result
+
+        Only files the download itself produced are considered (keepvideo
+        leaves them behind after conversion). Pinned files and protected
+        ones (files recorded by other active jobs) are kept.
+        """
+        if not result_file:
+            return []
+        keep = {self._key(result_file)}
+        keep.update(self._key(path) for path in protected)
+        with self._lock:
+            keep.update(self.pins)
+
+        candidates = []
+        for path in source_files:
+            candidates.append(path)
+            if self._key(path) == self._key(result_file):
+                # Converting to the same extension renames the source to *.orig.*
+                base, ext = os.path.splitext(path)
+                candidates.append(f"{base}.orig{ext}")
+
+        removed = []
+        for path in dict.fromkeys(candidates):
+            if self._key(path) in keep or not os.path.isfile(path):
+                continue
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError:
+                pass
+        return removed
+
+    def _scan(self) -> List[os.DirEntry]:
+        entries = []
+        stack = [self.directory]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            entries.append(entry)
+            except OSError:
+                continue
+        return entries
+
+    def sweep(self, pinned: Iterable[str] = ()) -> Dict:
+        """Reap stale temp files, then evict LRU files until within budget
+
+        Returns the reaped and evicted paths so callers can update jobs.
+        """
+        now = time.time()
+        with self._lock:
+            protected: Set[str] = set(self.pins)
+        protected.update(self._key(path) for path in pinned)
+
+        reaped, evicted = [], []
+        candidates = []
+        used = 0
+
+        for entry in self._scan():
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            key = self._key(entry.path)
+            stale = now - stat.st_mtime > self.grace_seconds
+
+            if self.is_temp(entry.path):
+                if stale and key not in protected:
+                    try:
+                        os.remove(entry.path)
+                        reaped.append(entry.path)
+                        continue
+                    except OSError:
+                        pass
+            elif stale and key not in protected:
+                last_used = self.last_access.get(key, max(stat.st_mtime, stat.st_atime))
+                candidates.append((last_used, entry.path, stat.st_size))
+            used += stat.st_size
+
+        free = self.free_bytes()
+        candidates.sort()
+        for _, path, size in candidates:
+            over_quota = self.quota_bytes and used > self.quota_bytes
+            low_space = self.min_free_bytes and free < self.min_free_bytes
+            if not (over_quota or low_space):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            evicted.append(path)
+            used -= size
+            free += size
+
+        with self._lock:
+            for path in reaped + evicted:
+                self.last_access.pop(self._key(path), None)
+            self.used_bytes = used
+            self.file_count = len(candidates) - len(evicted)
+            self.last_sweep = now
+            self.reaped_total += len(reaped)
+            self.evicted_total += len(evicted)
+
+        return {'reaped': reaped, 'evicted': evicted, 'used_bytes': used, 'free_bytes': free}
+
+    def snapshot(self) -> Dict:
+        """Usage figures for the metrics endpoint"""
+        return {
+            'directory': os.path.abspath(self.directory),
+            'used_bytes': self.used_bytes,
+            'quota_bytes': self.quota_bytes,
+            'free_bytes': self.free_bytes(),
+            'min_free_bytes': self.min_free_bytes,
+            'evictable_files': self.file_count,
+            'pinned_files': len(self.pins),
+            'reaped_total': self.reaped_total,
+            'evicted_total': self.evicted_total,
+            'last_sweep': self.last_sweep,
+            'accepting_downloads': self.has_capacity(),
+        }
@@ -0,0 +1,115 @@
+"""Work Queue - durable SQLite queue feeding out-of-process download workers"""
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class WorkQueue:
+    """Queue of download jobs claimed by worker processes under a lease
+
+    A claimed job whose worker stops heartbeating is handed to another
+    worker once the lease expires, so a crashed worker loses no work.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 60.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS work_queue (
+                job_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                worker_id TEXT,
+                enqueued_at REAL NOT NULL,
+                heartbeat_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS work_queue_enqueued ON work_queue (enqueued_at)"
+        )
+
+    def enqueue(self, job_id: str, payload: Dict):
+        """Add a job for the next free worker"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO work_queue (job_id, payload, enqueued_at) VALUES (?, ?, ?)",
+                (job_id, json.dumps(payload), time.time())
+            )
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Claim the oldest unclaimed (or abandoned) job
+
+        Returns {'job_id', 'payload', 'attempts'} or None if the queue is idle.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT job_id, payload, attempts FROM work_queue "
+                    "WHERE worker_id IS NULL OR heartbeat_at < ? "
+                    "ORDER BY enqueued_at LIMIT 1",
+                    (now - self.lease_seconds,)
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE work_queue SET worker_id = ?, heartbeat_at = ?, "
+                        "attempts = attempts + 1 WHERE job_id = ?",
+                        (worker_id, now, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if not row:
+            return None
+        return {'job_id': row[0], 'payload': json.loads(row[1]), 'attempts': row[2] + 1}
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease; False if the job was taken over or removed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE work_queue SET heartbeat_at = ? WHERE job_id = ? AND worker_id = ?",
+                (time.time(), job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        """Remove a finished (or abandoned for good) job
+
+        Only the worker holding the lease can remove it; False if another
+        worker has since reclaimed the job.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM work_queue WHERE job_id = ? AND worker_id = ?",
+                (job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def stats(self) -> Dict:
+        stale_before = time.time() - self.lease_seconds
+        with self._lock:
+            queued, claimed = self._conn.execute(
+                "SELECT "
+                "COALESCE(SUM(worker_id IS NULL OR heartbeat_at < ?), 0), "
+                "COALESCE(SUM(worker_id IS NOT NULL AND heartbeat_at >= ?), 0) "
+                "FROM work_queue",
+                (stale_before, stale_before)
+            ).fetchone()
+        return {'queued': queued, 'claimed': claimed}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
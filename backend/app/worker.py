@@ -0,0 +1,156 @@
+"""Download Worker - runs queued download jobs outside the API process
+
+Start the API with DOWNLOAD_MODE=queue and run any number of workers that
+share its JOBS_DB and DOWNLOADS_DIR (from backend/):
+
+    python -m app.worker --concurrency 2
+
+Workers claim jobs from the SQLite work queue, run the same download
+pipeline as the API and write progress to the shared job store, which the
+API picks up and serves to clients.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import uuid
+from typing import Dict, Set
+
+from .job_manager import JobStatus, TERMINAL_STATUSES
+from .work_queue import WorkQueue
+from . import main
+
+
+class Worker:
+    """Claim jobs from the work queue and run them with bounded concurrency"""
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        worker_id: str,
+        concurrency: int = 2,
+        poll_interval: float = 1.0
+    ):
+        self.queue = queue
+        self.worker_id = worker_id
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.stopping = asyncio.Event()
+        self.tasks: Set[asyncio.Task] = set()
+
+    def stop(self):
+        """Stop claiming new jobs; running jobs are allowed to finish"""
+        if not self.stopping.is_set():
+            print(f"Worker {self.worker_id} draining {len(self.tasks)} job(s)...")
+        self.stopping.set()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.concurrency)
+        print(f"Worker {self.worker_id} started (concurrency={self.concurrency})")
+
+        while not self.stopping.is_set():
+            await slots.acquire()
+            if self.stopping.is_set():
+                # stop() arrived while every slot was busy
+                slots.release()
+                break
+            claim = await loop.run_in_executor(None, self.queue.claim, self.worker_id)
+            if not claim:
+                slots.release()
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self.run_job(claim))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        print(f"Worker {self.worker_id} stopped")
+
+    async def _heartbeat(self, job_id: str, job_task: asyncio.Task):
+        """Renew the lease; stop the job if another worker has taken it over"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            alive = await loop.run_in_executor(None, self.queue.heartbeat, job_id, self.worker_id)
+            if not alive:
+                print(f"Worker {self.worker_id} lost the lease on job {job_id}, stopping it")
+                # The download runs in a thread; stop it before it touches the .part file again
+                main.downloader.cancel(job_id)
+                job_task.cancel()
+                return
+
+    async def run_job(self, claim: Dict):
+        job_id = claim['job_id']
+        payload = claim['payload']
+        job_manager = main.job_manager
+
+        job = job_manager.load_job(job_id)
+        try:
+            if not job or job['status'] in TERMINAL_STATUSES:
+                return
+
+            if claim['attempts'] > self.queue.max_attempts:
+                job_manager.update_job(
+                    job_id,
+                    status=JobStatus.FAILED,
+                    error=f"Gave up after {self.queue.max_attempts} attempts",
+                    current_line="Error: worker retries exhausted"
+                )
+                return
+
+            metadata = payload.get('metadata')
+            heartbeat = asyncio.create_task(self._heartbeat(job_id, asyncio.current_task()))
+            try:
+                # A source resolved by an earlier attempt lets yt-dlp resume its .part file
+                await main.process_download(
+                    job_id=job_id,
+                    url=job.get('source_url') or payload['url'],
+                    quality=main.Quality(payload['quality']),
+                    metadata=main.TrackMetadata(**metadata) if metadata else None
+                )
+            finally:
+                heartbeat.cancel()
+        finally:
+            # Unloading also makes late progress callbacks from a stopped download no-ops
+            job_manager.unload(job_id)
+            self.queue.complete(job_id, self.worker_id)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Spowlo download worker")
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv("WORKER_CONCURRENCY", "2")))
+    parser.add_argument('--worker-id', default=f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}")
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--progress-interval', type=float, default=0.5,
+                        help='seconds between progress writes to the job store')
+    return parser.parse_args(argv)
+
+
+async def run_worker(args):
+    if not main.JOBS_DB:
+        raise SystemExit("The worker needs JOBS_DB (shared with the API)")
+
+    queue = WorkQueue(main.JOBS_DB, lease_seconds=float(os.getenv("WORKER_LEASE_S", "60")))
+    main.job_manager.persist_interval = args.progress_interval
+    worker = Worker(queue, args.worker_id, args.concurrency, args.poll_interval)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            pass
+
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker(parse_args()))
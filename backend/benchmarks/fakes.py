@@ -0,0 +1,231 @@
+"""Local stand-ins for Spotify, JioSaavn and a YouTube-like media host
+
+All upstream services are replaced by one threaded HTTP server so the
+benchmark never touches the network. Responses mirror the shape of the
+real APIs closely enough for the backend's parsing code.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+
+def make_media_bytes(size: int) -> bytes:
+    """Build a deterministic payload of the given size to serve as audio"""
+    pattern = bytes(range(256))
+    return (pattern * (size // len(pattern) + 1))[:size]
+
+
+def fake_spotify_track(track_id: str, base_url: str) -> Dict:
+    """Spotify /v1/tracks/{id} response"""
+    return {
+        'id': track_id,
+        'name': f'Benchmark Track {track_id}',
+        'artists': [{'name': 'Bench Artist'}, {'name': 'Load Tester'}],
+        'album': {
+            'name': 'Offline Sessions',
+            'images': [{'url': f'{base_url}/cover.jpg', 'width': 640, 'height': 640}],
+        },
+        'duration_ms': 215000,
+    }
+
+
+def fake_jiosaavn_song(song_id: str, base_url: str) -> Dict:
+    """JioSaavn api.php?__call=song.getDetails response"""
+    return {
+        song_id: {
+            'id': song_id,
+            'song': f'Benchmark Song {song_id}',
+            'primary_artists': 'Bench Artist, Load Tester',
+            'album': 'Offline Sessions',
+            'duration': '215',
+            'image': f'{base_url}/cover.jpg',
+            'media_preview_url': f'{base_url}/media/{song_id}.m4a',
+        }
+    }
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients hanging up mid-response"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    """Serve Spotify, JioSaavn and media responses from memory"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _delay(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+    def _send_json(self, payload: Dict, status: int = 200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        if length:
+            self.rfile.read(length)
+        self._delay()
+
+        if self.path.startswith('/api/token'):
+            self._send_json({
+                'access_token': 'benchmark-token',
+                'token_type': 'Bearer',
+                'expires_in': 3600,
+            })
+        else:
+            self._send_json({'error': 'not found'}, status=404)
+
+    def do_HEAD(self):
+        self._serve_media(head_only=True)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        self._delay()
+
+        track_match = re.match(r'^/v1/tracks/([^/]+)$', parsed.path)
+        if track_match:
+            self._send_json(fake_spotify_track(track_match.group(1), self.base_url))
+        elif parsed.path == '/api.php':
+            params = parse_qs(parsed.query)
+            song_id = params.get('pids', ['unknown'])[0]
+            self._send_json(fake_jiosaavn_song(song_id, self.base_url))
+        elif parsed.path == '/cover.jpg':
+            body = self.server.cover
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._serve_media(head_only=False)
+
+    def _serve_media(self, head_only: bool):
+        """Serve the media payload, honouring single byte ranges"""
+        if not urlparse(self.path).path.startswith('/media/'):
+            self._send_json({'error': 'not found'}, status=404)
+            return
+
+        media = self.server.media
+        start, end = 0, len(media) - 1
+        status = 200
+
+        range_header = self.headers.get('Range')
+        range_match = re.match(r'bytes=(\d+)-(\d*)', range_header or '')
+        if range_match:
+            start = int(range_match.group(1))
+            if range_match.group(2):
+                end = min(int(range_match.group(2)), end)
+            if start > end:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(media)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            status = 206
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'audio/mp4')
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(end - start + 1))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(media)}')
+        self.end_headers()
+
+        if head_only:
+            return
+
+        view = memoryview(media)
+        chunk_size = 64 * 1024
+        try:
+            for offset in range(start, end + 1, chunk_size):
+                self.wfile.write(view[offset:min(offset + chunk_size, end + 1)])
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class FakeUpstream:
+    """Run the fake upstream server on a background thread"""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        media_file: Optional[str] = None,
+        media_size: int = 512 * 1024,
+        latency_ms: float = 0.0
+    ):
+        self.server = QuietHTTPServer((host, port), FakeUpstreamHandler)
+        self.server.latency = latency_ms / 1000.0
+        self.server.cover = make_media_bytes(16 * 1024)
+        if media_file:
+            with open(media_file, 'rb') as f:
+                self.server.media = f.read()
+        else:
+            self.server.media = make_media_bytes(media_size)
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def media_url(self, name: str) -> str:
+        """URL of the served media file under a unique name"""
+        return f'{self.base_url}/media/{name}.m4a'
+
+    def environment(self) -> Dict[str, str]:
+        """Environment overrides that point the backend at this server"""
+        return {
+            'SPOTIFY_AUTH_URL': f'{self.base_url}/api/token',
+            'SPOTIFY_API_BASE': self.base_url,
+            'JIOSAAVN_API_URL': f'{self.base_url}/api.php',
+        }
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    upstream = FakeUpstream(port=int(os.getenv('FAKE_UPSTREAM_PORT', '9000')))
+    print(f'Fake upstream listening on {upstream.base_url}')
+    for key, value in upstream.environment().items():
+        print(f'  export {key}="{value}"')
+    upstream.server.serve_forever()
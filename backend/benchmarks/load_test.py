@@ -0,0 +1,351 @@
+"""Offline load test for the Spowlo backend
+
+Starts the fake upstream server, runs the FastAPI app in-process on a
+background event loop and drives the download, job-status and SSE
+endpoints at a configurable concurrency.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --scenario all --concurrency 8 --requests 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from .fakes import FakeUpstream
+
+
+TERMINAL_STATUSES = {'completed', 'failed', 'cancelled'}
+SCENARIOS = ('metadata', 'job', 'sse')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile, 0.0 for an empty sample"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def read_rss() -> Dict[str, int]:
+    """Current and peak resident set size of this process in bytes"""
+    rss = {'current': 0, 'peak': 0}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    rss['current'] = int(line.split()[1]) * 1024
+                elif line.startswith('VmHWM:'):
+                    rss['peak'] = int(line.split()[1]) * 1024
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and kilobytes elsewhere
+        rss['peak'] = peak if sys.platform == 'darwin' else peak * 1024
+    return rss
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class BackendServer:
+    """Run the FastAPI app under uvicorn on a background thread
+
+    The server's event loop also runs a probe task that records how late
+    each sleep wakes up, which is the event-loop lag seen by handlers.
+    """
+
+    def __init__(self, app, port: int, lag_interval: float = 0.05):
+        import uvicorn
+
+        config = uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning')
+        self.server = uvicorn.Server(config)
+        self.base_url = f'http://127.0.0.1:{port}'
+        self.lag_interval = lag_interval
+        self.lag_samples: List[Tuple[float, float]] = []
+        self.thread: Optional[threading.Thread] = None
+
+    async def _probe_lag(self):
+        while not self.server.should_exit:
+            start = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            lag = time.perf_counter() - start - self.lag_interval
+            self.lag_samples.append((time.perf_counter(), max(lag, 0.0)))
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.create_task(self._probe_lag())
+        loop.run_until_complete(self.server.serve())
+        loop.close()
+
+    def lag_between(self, start: float, end: float) -> List[float]:
+        return [lag for ts, lag in self.lag_samples if start <= ts <= end]
+
+    def start(self, timeout: float = 30.0):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError('Backend server failed to start')
+            time.sleep(0.02)
+
+    def stop(self):
+        self.server.should_exit = True
+        if self.thread:
+            self.thread.join(timeout=10)
+
+
+class Recorder:
+    """Thread-safe latency and error collection per operation"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, op: str, seconds: float):
+        with self.lock:
+            self.latencies.setdefault(op, []).append(seconds)
+
+    def error(self, op: str):
+        with self.lock:
+            self.errors[op] = self.errors.get(op, 0) + 1
+
+
+class LoadTest:
+    """Drive the backend endpoints and summarise the results"""
+
+    def __init__(self, base_url: str, upstream: FakeUpstream, args):
+        self.base_url = base_url.rstrip('/')
+        self.upstream = upstream
+        self.args = args
+        self.local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def _timed(self, recorder: Recorder, op: str, method: str, path: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.args.timeout, **kwargs)
+            response.raise_for_status()
+        except Exception:
+            recorder.error(op)
+            raise
+        recorder.record(op, time.perf_counter() - start)
+        return response
+
+    def _start_download(self, recorder: Recorder) -> str:
+        payload = {
+            'url': self.upstream.media_url(f'bench-{uuid.uuid4().hex[:12]}'),
+            'quality': self.args.quality,
+        }
+        response = self._timed(recorder, 'POST /api/download', 'POST', '/api/download', json=payload)
+        return response.json()['job_id']
+
+    def op_metadata(self, i: int, recorder: Recorder):
+        if i % 2 == 0:
+            self._timed(recorder, 'GET /api/metadata/spotify', 'GET', f'/api/metadata/spotify/bench{i}')
+        else:
+            self._timed(recorder, 'GET /api/metadata/jiosaavn', 'GET', f'/api/metadata/jiosaavn/bench{i}')
+
+    def op_job(self, i: int, recorder: Recorder):
+        start = time.perf_counter()
+        job_id = self._start_download(recorder)
+        while True:
+            job = self._timed(recorder, 'GET /api/job/{id}', 'GET', f'/api/job/{job_id}').json()
+            if job['status'] in TERMINAL_STATUSES:
+                break
+            time.sleep(self.args.poll_interval)
+        if job['status'] != 'completed':
+            recorder.error('job completion')
+            return
+        recorder.record('job completion', time.perf_counter() - start)
+
+    def op_sse(self, i: int, recorder: Recorder):
+        start = time.perf_counter()
+        job_id = self._start_download(recorder)
+        status = None
+        first_event = None
+        with self.session.get(
+            f'{self.base_url}/api/job/{job_id}/events',
+            stream=True,
+            timeout=self.args.timeout
+        ) as response:
+            for line in response.iter_lines():
+                if not line.startswith(b'data:'):
+                    continue
+                if first_event is None:
+                    first_event = time.perf_counter()
+                    recorder.record('SSE first event', first_event - start)
+                status = json.loads(line[5:]).get('status')
+                if status in TERMINAL_STATUSES:
+                    break
+        if status != 'completed':
+            recorder.error('SSE completion')
+            return
+        recorder.record('SSE completion', time.perf_counter() - start)
+
+    def run_scenario(self, name: str, server: Optional[BackendServer]) -> Dict:
+        op = getattr(self, f'op_{name}')
+        recorder = Recorder()
+
+        def run_one(i: int):
+            try:
+                op(i, recorder)
+            except Exception:
+                pass
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+            list(pool.map(run_one, range(self.args.requests)))
+        elapsed = time.perf_counter() - start
+
+        result = {
+            'scenario': name,
+            'concurrency': self.args.concurrency,
+            'requests': self.args.requests,
+            'elapsed_s': elapsed,
+            'throughput_per_s': self.args.requests / elapsed if elapsed else 0.0,
+            'operations': {},
+            'rss_bytes': read_rss(),
+        }
+        for op_name, values in recorder.latencies.items():
+            result['operations'][op_name] = {
+                'count': len(values),
+                'errors': recorder.errors.get(op_name, 0),
+                'p50_ms': percentile(values, 50) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+                'max_ms': max(values) * 1000,
+            }
+        for op_name, count in recorder.errors.items():
+            result['operations'].setdefault(op_name, {'count': 0, 'errors': count})
+
+        if server:
+            lags = server.lag_between(start, start + elapsed)
+            result['event_loop_lag'] = {
+                'samples': len(lags),
+                'p50_ms': percentile(lags, 50) * 1000,
+                'p99_ms': percentile(lags, 99) * 1000,
+                'max_ms': max(lags) * 1000 if lags else 0.0,
+            }
+        else:
+            # External server: use its own loop monitor (GET /api/metrics)
+            try:
+                lag = self.session.get(f'{self.base_url}/api/metrics', timeout=5).json()['event_loop']
+                result['event_loop_lag'] = {
+                    'samples': lag['samples'],
+                    'p50_ms': lag['lag_ms']['p50'],
+                    'p99_ms': lag['lag_ms']['p99'],
+                    'max_ms': lag['lag_ms']['max'],
+                }
+            except Exception:
+                pass
+        return result
+
+
+def print_report(result: Dict):
+    print(f"\n== {result['scenario']} "
+          f"(concurrency={result['concurrency']}, requests={result['requests']}) ==")
+    print(f"  elapsed {result['elapsed_s']:.2f}s, throughput {result['throughput_per_s']:.1f}/s")
+    print(f"  {'operation':<28}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for op_name, stats in sorted(result['operations'].items()):
+        print(f"  {op_name:<28}{stats['count']:>7}{stats['errors']:>8}"
+              f"{stats.get('p50_ms', 0):>10.1f}{stats.get('p99_ms', 0):>10.1f}{stats.get('max_ms', 0):>10.1f}")
+    lag = result.get('event_loop_lag')
+    if lag:
+        print(f"  event-loop lag: p50 {lag['p50_ms']:.1f}ms, p99 {lag['p99_ms']:.1f}ms, "
+              f"max {lag['max_ms']:.1f}ms ({lag['samples']} samples)")
+    rss = result['rss_bytes']
+    print(f"  RSS: {rss['current'] / 1048576:.1f} MiB (peak {rss['peak'] / 1048576:.1f} MiB)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Offline load test for the Spowlo backend')
+    parser.add_argument('--scenario', choices=SCENARIOS + ('all',), default='all')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=50, help='operations per scenario')
+    parser.add_argument('--quality', default='best', choices=['m4a_320', 'opus_160', 'best'],
+                        help='conversion presets other than "best" require ffmpeg')
+    parser.add_argument('--poll-interval', type=float, default=0.2)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--media-file', help='serve this file instead of synthetic bytes')
+    parser.add_argument('--media-size', type=int, default=512 * 1024)
+    parser.add_argument('--upstream-latency-ms', type=float, default=0.0)
+    parser.add_argument('--target', help='drive an already running backend instead of an in-process one')
+    parser.add_argument('--json', dest='json_path', help='also write results as JSON to this path')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    scenarios = SCENARIOS if args.scenario == 'all' else (args.scenario,)
+
+    upstream = FakeUpstream(
+        media_file=args.media_file,
+        media_size=args.media_size,
+        latency_ms=args.upstream_latency_ms
+    )
+    upstream.start()
+    work_dir = tempfile.mkdtemp(prefix='spowlo-bench-')
+    server = None
+
+    try:
+        if args.target:
+            base_url = args.target
+            print(f'Driving {base_url}; start it with these overrides:')
+            for key, value in upstream.environment().items():
+                print(f'  {key}={value}')
+        else:
+            os.environ.update(upstream.environment())
+            os.environ['DOWNLOADS_DIR'] = os.path.join(work_dir, 'downloads')
+            os.environ['JOBS_DB'] = os.path.join(work_dir, 'jobs.db')
+            from app.main import app
+
+            server = BackendServer(app, port=free_port())
+            server.start()
+            base_url = server.base_url
+
+        load_test = LoadTest(base_url, upstream, args)
+        results = []
+        for name in scenarios:
+            results.append(load_test.run_scenario(name, server))
+
+        # Report once at the end so yt-dlp's console output doesn't interleave
+        for result in results:
+            print_report(result)
+
+        if args.json_path:
+            with open(args.json_path, 'w') as f:
+                json.dump(results, f, indent=2)
+    finally:
+        if server:
+            server.stop()
+        upstream.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())